@@ -24,5 +24,6 @@ setup(
     ],
     extras_require={
         "dev": ["pytest>=8.0.0", "pytest-cov>=4.0.0"],
+        "hyperscan": ["hyperscan>=0.4.0"],
     },
 )
\ No newline at end of file
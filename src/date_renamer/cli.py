@@ -26,11 +26,17 @@ def main():
         action="store_true",
         help="Disable backup creation (backups enabled by default)"
     )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="Log every file as it is processed"
+    )
     args = parser.parse_args()
 
     try:
         # Create renamer with backup enabled by default (disabled with --no-backup flag)
-        renamer = DateFileRenamer(backup_dir=not args.no_backup)
+        renamer = DateFileRenamer(backup_dir=not args.no_backup, verbose=args.verbose)
         renamer.process_directory(args.directory, args.recursive)
         renamer.print_summary()
     except Exception as e:
@@ -1,48 +1,330 @@
 """Core functionality for renaming files based on dates in their filenames."""
 
+import errno
+import functools
+import os
 import re
 import shutil
-from datetime import datetime
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 
+try:
+    import hyperscan
+except ImportError:  # Optional accelerator, see extras_require in setup.py
+    hyperscan = None
+
+if sys.platform.startswith('linux'):
+    import fcntl
+    _FICLONE = 0x40049409  # From <linux/fs.h>
+    _clonefile = None
+elif sys.platform == 'darwin':
+    import ctypes
+    import ctypes.util
+    fcntl = None
+    _clonefile = getattr(ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True),
+                         'clonefile', None)  # macOS 10.12+
+    if _clonefile is not None:
+        _clonefile.argtypes = (ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint32)
+else:
+    fcntl = None
+    _clonefile = None
+
+_DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def _valid_ymd(year, month, day):
+    """Check that year/month/day form a real calendar date.
+    
+    Equivalent to datetime.strptime(..., '%Y%m%d') succeeding, without the
+    cost of parsing a format string for every candidate.
+    """
+    if year < 1 or not 1 <= month <= 12 or day < 1:
+        return False
+    if month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+        return day <= 29
+    return day <= _DAYS_IN_MONTH[month - 1]
+
+
+def _iter_files(directory, recursive):
+    """Yield the paths of files in directory as strings.
+    
+    Uses os.scandir so file types come from the directory listing itself
+    rather than a stat call per entry. Symlinked directories are not followed,
+    and subdirectories that can't be read are skipped.
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file():
+                yield entry.path
+            elif recursive and entry.is_dir(follow_symlinks=False):
+                try:
+                    yield from _iter_files(entry.path, True)
+                except PermissionError:
+                    continue
+
+
+# Errors meaning the filesystem (or pair of filesystems) can't clone at all
+_CLONE_UNSUPPORTED = {errno.EOPNOTSUPP, errno.ENOTSUP, errno.EXDEV, errno.EINVAL,
+                      errno.ENOTTY, errno.ENOSYS}
+
+# Destination directories where cloning has failed that way; files backed up
+# into them go straight to shutil.copy2
+_no_clone_dirs = set()
+
+
+def _clone(src, dst):
+    """Make dst a copy-on-write clone of src, returning False if that isn't possible.
+    
+    The clone is made under a temporary name next to dst and only moved over
+    it once it has succeeded, so a failed attempt never touches an existing dst.
+    """
+    if fcntl is None and _clonefile is None:
+        return False
+    dst_dir = os.path.dirname(os.path.abspath(dst))
+    if dst_dir in _no_clone_dirs:
+        return False
+    try:
+        fd, tmp_path = tempfile.mkstemp(prefix='.', suffix='.clone', dir=dst_dir)
+    except OSError:
+        return False
+    try:
+        if fcntl is not None:
+            with os.fdopen(fd, 'wb') as tmp_file, open(src, 'rb') as src_file:
+                fcntl.ioctl(tmp_file.fileno(), _FICLONE, src_file.fileno())
+        else:
+            # clonefile creates the destination itself
+            os.close(fd)
+            os.unlink(tmp_path)
+            if _clonefile(os.fsencode(src), os.fsencode(tmp_path), 0) != 0:
+                error = ctypes.get_errno()
+                raise OSError(error, os.strerror(error))
+    except OSError as e:
+        if e.errno in _CLONE_UNSUPPORTED:
+            _no_clone_dirs.add(dst_dir)
+        _remove_quietly(tmp_path)
+        return False
+    try:
+        os.replace(tmp_path, dst)
+    except OSError:
+        _remove_quietly(tmp_path)
+        return False
+    return True
+
+
+def _remove_quietly(path):
+    """Delete path if it exists, ignoring errors."""
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _cheap_backup(src, dst):
+    """Copy src to dst with its metadata, like shutil.copy2.
+    
+    On filesystems with reflink support (btrfs, XFS, APFS) the data is cloned
+    rather than copied, which costs the same however large the file is.
+    """
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+    if _clone(src, dst):
+        shutil.copystat(src, dst)
+    else:
+        shutil.copy2(src, dst)
+
+
+# Most extraction results each cache holds; once full it is emptied, so a
+# long recursive run doesn't keep a result for every file it has seen
+_CACHE_SIZE = 4096
+
+# Per-file log lines are written in batches of this many
+_LOG_BATCH_SIZE = 1000
+
+# Number of files from which filenames are classified in worker processes.
+# Classifying takes roughly 5-8us per name in-process, while starting a pool
+# and shipping names to it costs tens of milliseconds, so smaller batches
+# finish sooner without one even when several CPUs are free
+_PARALLEL_THRESHOLD = 5000
+
+_worker_renamer = None
+
+
+def _available_cpus():
+    """Return how many CPUs this process is allowed to run on."""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _init_worker(renamer_class):
+    """Give each worker process its own renamer to classify filenames with."""
+    global _worker_renamer
+    _worker_renamer = renamer_class(backup_dir=False)
+
+
+def _classify(filename):
+    """Return the new name for filename in a worker process, or None if it has no date."""
+    return _worker_renamer._new_filename(filename)
+
+
 class DateFileRenamer:
-    def __init__(self, backup_dir=True):
+    # Runs of separators left behind once the date is removed from a name
+    _CLEAN_SEPS = re.compile(r'[-_]+')
+
+    def __init__(self, backup_dir=True, verbose=False):
         # backup_dir: True for default backup behavior, False to disable, or a Path for custom location
+        # verbose: log every file found and processed, not just the summary
+        self.verbose = verbose
         self.backup_enabled = backup_dir is not False
         self.backup_dir = backup_dir if isinstance(backup_dir, Path) else None
         self.backup_location = None  # Set when processing starts
+        self._backup_ready = False  # Whether backup_location has been created yet
         
-        # Dictionary of regex patterns and their corresponding datetime format strings
+        # Regex patterns keyed by the layout of their capture groups
         month_names = r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)'
-        self.date_patterns = {
+        date_patterns = {
             # YYYY-MM-DD or YYYY_MM_DD
-            r'(\d{4})[-_](\d{2})[-_](\d{2})': '%Y%m%d',
+            'ymd': r'(\d{4})[-_](\d{2})[-_](\d{2})',
             # DD-MM-YYYY or DD_MM_YYYY
-            r'(\d{2})[-_](\d{2})[-_](\d{4})': '%Y%m%d',
+            'dmy': r'(\d{2})[-_](\d{2})[-_](\d{4})',
             # YYYYMMDD (8 consecutive digits, no separators - WhatsApp style)
-            r'(?<!\d)(\d{4})(\d{2})(\d{2})(?!\d)': '%Y%m%d',  # Must come before MMDDYYYY
+            'ymd8': r'(?<!\d)(\d{4})(\d{2})(\d{2})(?!\d)',  # Must come before MMDDYYYY
             # MMDDYYYY
-            r'(?<!\d)(\d{2})(\d{2})(\d{4})(?!\d)': '%Y%m%d',  # Match 8 digits not surrounded by digits
+            'mdy8': r'(?<!\d)(\d{2})(\d{2})(\d{4})(?!\d)',  # Match 8 digits not surrounded by digits
             # DD(Mon)YY or DD-(Mon)-YY
-            rf'(\d{{1,2}})[-_]?({month_names})[-_]?(\d{{2}})(?!\d)': '%Y%m%d',
+            'dmon': rf'(\d{{1,2}})[-_]?({month_names})[-_]?(\d{{2}})(?!\d)',
             # (Mon)DD,YY or (Mon)_DD_YY
-            rf'({month_names})[-_]?(\d{{1,2}})[-,_]?(\d{{2}})(?!\d)': '%Y%m%d',
+            'mond': rf'({month_names})[-_]?(\d{{1,2}})[-,_]?(\d{{2}})(?!\d)',
         }
         
         # Datetime patterns (checked before date-only patterns)
-        self.datetime_patterns = {
+        datetime_patterns = {
             # YYYYMMDD_HHMMSSMMM or YYYYMMDD_HHMMSS (e.g., PXL_20260204_181153683)
-            r'(\d{4})(\d{2})(\d{2})[-_](\d{2})(\d{2})(\d{2})(\d{3})?': 'datetime_yyyymmdd_hhmmss',
+            'ymd_hms': r'(\d{4})(\d{2})(\d{2})[-_](\d{2})(\d{2})(\d{2})(\d{3})?',
         }
         
+        # Compile once up front so each file doesn't pay for a regex cache lookup.
+        # The individual patterns extract the groups; the fused alternation of all
+        # of them locates the next candidate with a single scan of the filename.
+        # re.ASCII keeps \d to 0-9 and month names to plain letters, as strptime
+        # and the month table expect.
+        self.date_patterns = [
+            (name, re.compile(pattern, re.IGNORECASE | re.ASCII)) for name, pattern in date_patterns.items()
+        ]
+        self.datetime_patterns = [
+            (name, re.compile(pattern, re.IGNORECASE | re.ASCII)) for name, pattern in datetime_patterns.items()
+        ]
+        self._date_regex = self._fuse_patterns(date_patterns)
+        self._datetime_regex = self._fuse_patterns(datetime_patterns)
+        self._date_prefilter = self._build_prefilter(tuple(date_patterns.values()))
+        self._datetime_prefilter = self._build_prefilter(tuple(datetime_patterns.values()))
+        
         self.month_map = {
             'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04',
             'May': '05', 'Jun': '06', 'Jul': '07', 'Aug': '08',
             'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12'
         }
+        # Month names are matched case-insensitively, so look them up lowercased
+        self._month_lower = {name.lower(): number for name, number in self.month_map.items()}
         self.renamed_files = []
         self.skipped_files = []
         self.backup_files = []  # Track files that were backed up
+        
+        # Extraction results keyed by filename; they depend on nothing else.
+        # Bounded by _CACHE_SIZE
+        self._date_cache = {}
+        self._datetime_cache = {}
+
+    @staticmethod
+    def _fuse_patterns(patterns):
+        """Combine named patterns into one alternation with a named group per pattern.
+        
+        Returns the alternation compiled twice: for str, and for bytes so that
+        ASCII filenames can be scanned as bytes.
+        """
+        fused = '|'.join(f'(?P<{name}>{pattern})' for name, pattern in patterns.items())
+        return (re.compile(fused, re.IGNORECASE | re.ASCII),
+                re.compile(fused.encode('ascii'), re.IGNORECASE))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _build_prefilter(patterns):
+        """Build a function that cheaply rules out text no pattern can match.
+        
+        Returns None if Hyperscan isn't installed. Hyperscan doesn't support
+        lookarounds, so the database is compiled in prefilter mode: it may pass
+        filenames that re then rejects, but never rejects one that re would
+        match. Building is slow, so prefilters are shared between instances.
+        """
+        if hyperscan is None:
+            return None
+        flags = (hyperscan.HS_FLAG_PREFILTER | hyperscan.HS_FLAG_SINGLEMATCH
+                 | hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_UTF8)
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[pattern.encode() for pattern in patterns],
+            ids=list(range(len(patterns))),
+            elements=len(patterns),
+            flags=[flags] * len(patterns),
+        )
+        scratch = hyperscan.Scratch(database)
+
+        def may_match(text):
+            try:
+                data = text.encode('utf-8')
+            except UnicodeEncodeError:
+                # e.g. surrogate-escaped filenames; let re decide
+                return True
+            hits = []
+            database.scan(data, match_event_handler=lambda *args: hits.append(args), scratch=scratch)
+            return bool(hits)
+        return may_match
+
+    @staticmethod
+    def _may_match(prefilter, text):
+        """Return False only if the prefilter proves no pattern can match text."""
+        return prefilter is None or prefilter(text)
+
+    @staticmethod
+    def _iter_matches(fused, patterns, text):
+        """Yield (name, match) for each pattern hit in text, leftmost first.
+        
+        The fused regex finds the next position where any pattern matches. Every
+        pattern from the winning alternative onwards is then tried at that
+        position, so a later pattern still gets a chance if an earlier one
+        produced an invalid date. ASCII text is searched as bytes; its offsets
+        are the same, so the matches yielded are always against text itself.
+        """
+        fused_str, fused_bytes = fused
+        if text.isascii():
+            fused, haystack = fused_bytes, text.encode('ascii')
+        else:
+            fused, haystack = fused_str, text
+        names = [name for name, _ in patterns]
+        pos = 0
+        while True:
+            match = fused.search(haystack, pos)
+            if not match:
+                return
+            start = match.start()
+            for name, compiled in patterns[names.index(match.lastgroup):]:
+                candidate = compiled.match(text, start)
+                if candidate:
+                    yield name, candidate
+            pos = start + 1
+
+    @staticmethod
+    def _cached(cache, extract, filename):
+        """Return extract(filename), memoized in cache."""
+        result = cache.get(filename)
+        if result is None:
+            if len(cache) >= _CACHE_SIZE:
+                cache.clear()
+            result = cache[filename] = extract(filename)
+        return result
 
     def extract_datetime(self, filename):
         """Extract datetime from filename using datetime patterns.
@@ -53,94 +335,92 @@ class DateFileRenamer:
                 - matched_str: The original matched portion of the filename
                 - has_time: Boolean indicating if time was found
         """
-        for pattern in self.datetime_patterns.keys():
-            search_text = f" {filename} "
-            match = re.search(pattern, search_text, re.IGNORECASE)
-            if match:
-                try:
-                    groups = match.groups()
-                    if len(groups) >= 6:
-                        year, month, day, hour, minute, second = groups[:6]
-                        milliseconds = groups[6] if len(groups) > 6 and groups[6] else None
-                        
-                        # Validate datetime
-                        date_str = f"{year}{month}{day}"
-                        time_str = f"{hour}{minute}{second}"
-                        full_datetime_str = f"{date_str}{time_str}"
-                        datetime.strptime(full_datetime_str, '%Y%m%d%H%M%S')
-                        
-                        # Format as ISO 8601: YYYYMMDDTHHMMSS or YYYYMMDDTHHMMSS.mmm
-                        iso_str = f"{year}{month}{day}T{hour}{minute}{second}"
-                        if milliseconds:
-                            iso_str += f".{milliseconds}"
-                        
-                        return iso_str, match.group().strip(), True
-                except ValueError:
-                    continue
+        return self._cached(self._datetime_cache, self._extract_datetime, filename)
+
+    def _extract_datetime(self, filename):
+        """Uncached implementation of extract_datetime."""
+        if not self._may_match(self._datetime_prefilter, filename):
+            return None, None, False
+        for name, match in self._iter_matches(self._datetime_regex, self.datetime_patterns, filename):
+            groups = match.groups()
+            year, month, day, hour, minute, second = groups[:6]
+            milliseconds = groups[6]
+            
+            # Validate datetime
+            if not (_valid_ymd(int(year), int(month), int(day))
+                    and int(hour) < 24 and int(minute) < 60 and int(second) < 60):
+                continue
+            
+            # Format as ISO 8601: YYYYMMDDTHHMMSS or YYYYMMDDTHHMMSS.mmm
+            iso_str = f"{year}{month}{day}T{hour}{minute}{second}"
+            if milliseconds:
+                iso_str += f".{milliseconds}"
+            
+            return iso_str, match.group(), True
         
         return None, None, False
 
     def extract_date(self, filename):
-        """Extract date from filename using various patterns."""
-        for pattern in self.date_patterns.keys():
-            # Add separators to help with boundary matching
-            search_text = f" {filename} "
-            match = re.search(pattern, search_text, re.IGNORECASE)
-            if match:
-                try:
-                    groups = match.groups()
-                    matched_str = match.group()
-                    if len(groups) == 3:
-                        # Check for text month format (either DD-Mon-YY or Mon-DD-YY)
-                        if any(month.upper() in groups[1].upper() for month in self.month_map.keys()):
-                            # DD-Mon-YY format
-                            month = self.month_map[groups[1].capitalize()]
-                            day = groups[0].zfill(2) if len(groups[0]) == 1 else groups[0]
-                            year = f"20{groups[2]}" if len(groups[2]) == 2 else groups[2]
-                        elif any(month.upper() in groups[0].upper() for month in self.month_map.keys()):
-                            # Mon-DD-YY format
-                            month = self.month_map[groups[0].capitalize()]
-                            day = groups[1].zfill(2) if len(groups[1]) == 1 else groups[1]
-                            year = f"20{groups[2]}" if len(groups[2]) == 2 else groups[2]
-                        elif '-' in matched_str or '_' in matched_str:
-                            # Separator-based patterns (DD-MM-YYYY or YYYY-MM-DD)
-                            if len(groups[0]) == 4:
-                                # YYYY-MM-DD format
-                                year, month, day = groups
-                            else:
-                                # DD-MM-YYYY format
-                                day, month, year = groups
-                        else:
-                            # No separators - need to determine YYYYMMDD vs MMDDYYYY
-                            # Check the length of the first group to disambiguate
-                            if len(groups[0]) == 4:
-                                # YYYYMMDD format - first group is 4-digit year
-                                year, month, day = groups
-                            else:
-                                # MMDDYYYY format - check if first two digits are valid month (01-12)
-                                first_two = int(groups[0])
-                                if 1 <= first_two <= 12:
-                                    month, day, year = groups
-                                else:
-                                    day, month, year = groups
-
-                        # Create standardized date string
-                        date_str = f"{year}{month.zfill(2)}{day.zfill(2)}"
-                        # Validate the date
-                        datetime.strptime(date_str, '%Y%m%d')
-                        return date_str, match.group().strip()
-                except ValueError:
-                    continue
+        """Extract date from filename using various patterns.
+        
+        The leftmost valid date wins; when several patterns match at the same
+        position they are tried in the order they are declared.
+        """
+        return self._cached(self._date_cache, self._extract_date, filename)
+
+    def _extract_date(self, filename):
+        """Uncached implementation of extract_date."""
+        if not self._may_match(self._date_prefilter, filename):
+            return None, None
+        month_lower = self._month_lower
+        for name, match in self._iter_matches(self._date_regex, self.date_patterns, filename):
+            groups = match.groups()
+            if name == 'dmon':
+                # DD-Mon-YY format
+                month = month_lower[groups[1].lower()]
+                day = groups[0]
+                year = f"20{groups[2]}"
+            elif name == 'mond':
+                # Mon-DD-YY format
+                month = month_lower[groups[0].lower()]
+                day = groups[1]
+                year = f"20{groups[2]}"
+            elif name in ('ymd', 'ymd8'):
+                # YYYY-MM-DD or YYYYMMDD format
+                year, month, day = groups
+            elif name == 'dmy':
+                # DD-MM-YYYY format
+                day, month, year = groups
+            else:
+                # MMDDYYYY format - check if first two digits are valid month (01-12)
+                first_two = int(groups[0])
+                if 1 <= first_two <= 12:
+                    month, day, year = groups
+                else:
+                    day, month, year = groups
+
+            # Validate the date and create standardized date string
+            if _valid_ymd(int(year), int(month), int(day)):
+                return f"{year}{month.zfill(2)}{day.zfill(2)}", match.group()
         return None, None
 
     def rename_file(self, filepath):
         """Rename a file based on the date or datetime found in its name."""
-        path = Path(filepath)
-        if not path.is_file():
+        if not os.path.isfile(filepath):
             return
+        self._rename_file(os.fspath(filepath))
 
-        filename = path.name
-        
+    def _rename_file(self, filepath):
+        """Rename filepath, a path string already known to be a file."""
+        filename = os.path.basename(filepath)
+        new_filename = self._new_filename(filename)
+        if new_filename is None:
+            self.skipped_files.append(filename)
+            return
+        self._apply_renames([(filepath, new_filename)])
+
+    def _new_filename(self, filename):
+        """Return the date-prefixed name for filename, or None if it has no date."""
         # Try to extract datetime first (which includes time)
         datetime_str, matched_datetime, has_time = self.extract_datetime(filename)
         
@@ -153,83 +433,154 @@ class DateFileRenamer:
             date_str, matched_str = self.extract_date(filename)
         
         if not date_str:
-            self.skipped_files.append(filename)
-            return
+            return None
 
-        # Split filename and extension
-        name_without_ext = filename.rsplit('.', 1)[0]
-        ext = filename.split('.')[-1]
-        
-        # Remove the matched date/datetime from the name
-        # Try a series of replacement strategies, from most specific to least
-        name_without_date = name_without_ext
+        # Split filename and extension (ext keeps its dot, and is empty if there is none)
+        name_without_ext, ext = os.path.splitext(filename)
         
-        # Strategy 1: Remove with separator on both sides
-        pattern_with_separators = f'[-_]{re.escape(matched_str)}[-_]'
-        name_without_date = re.sub(pattern_with_separators, '_', name_without_date)
+        # Remove the matched date/datetime from the name. A separator on only one
+        # side of it goes too ("a_DATE.b" -> "a.b"); separators on both sides are
+        # kept and collapsed to one by the cleanup below ("a_DATE_b" -> "a_b")
+        pieces = name_without_ext.split(matched_str)
+        name_without_date = pieces[0]
+        for piece in pieces[1:]:
+            left_sep = name_without_date.endswith(('-', '_'))
+            right_sep = piece.startswith(('-', '_'))
+            if left_sep and not right_sep:
+                name_without_date = name_without_date[:-1]
+            elif right_sep and not left_sep:
+                piece = piece[1:]
+            name_without_date += piece
         
-        # Strategy 2: Remove with separator on left only (replace with nothing)
-        if name_without_date == name_without_ext:
-            pattern_leading_sep = f'[-_]{re.escape(matched_str)}'
-            name_without_date = re.sub(pattern_leading_sep, '', name_without_ext)
+        # Clean up multiple separators and remove leading/trailing underscores
+        name_without_date = self._CLEAN_SEPS.sub('_', name_without_date).strip('_')
         
-        # Strategy 3: Remove with separator on right only (replace with nothing)
-        if name_without_date == name_without_ext:
-            pattern_trailing_sep = f'{re.escape(matched_str)}[-_]'
-            name_without_date = re.sub(pattern_trailing_sep, '', name_without_ext)
+        # Create the new filename with datetime/date prefix and original extension
+        return f"{date_str}_{name_without_date}{ext}"
+
+    def _classify_all(self, filenames):
+        """Return the new name for each filename, or None where there is no date.
         
-        # Strategy 4: Direct string replacement (handles dots and other cases)
-        if name_without_date == name_without_ext:
-            name_without_date = name_without_ext.replace(matched_str, '')
+        Large batches are spread over worker processes when more than one CPU
+        is available, since the regex work is CPU-bound and independent per file.
+        Each worker builds a fresh instance of this renamer's class, so
+        subclasses are honoured but changes made to this instance's patterns
+        after construction are not.
+        """
+        cpus = _available_cpus()
+        if cpus > 1 and len(filenames) >= _PARALLEL_THRESHOLD:
+            try:
+                with ProcessPoolExecutor(max_workers=cpus, initializer=_init_worker,
+                                         initargs=(type(self),)) as pool:
+                    return list(pool.map(_classify, filenames, chunksize=64))
+            except (OSError, NotImplementedError, BrokenProcessPool):
+                # Worker processes aren't available here; classify in-process
+                pass
+        new_filename = self._new_filename
+        return [new_filename(filename) for filename in filenames]
+
+    def _apply_renames(self, plans):
+        """Back up and rename files, given (filepath, new_filename) pairs.
         
-        # Clean up multiple separators and remove leading/trailing underscores
-        name_without_date = re.sub(r'[-_]+', '_', name_without_date).strip('_')
+        Backup copies are the slow part, so they run concurrently in a thread
+        pool; the renames themselves then happen in order, and a file whose
+        backup failed is left untouched.
+        """
+        backup_location = self.backup_location if self.backup_enabled else None
+        backup_errors = {}
+        if backup_location and plans:
+            if not self._backup_ready:
+                backup_location.mkdir(parents=True, exist_ok=True)
+                self._backup_ready = True
+            # Same-named files from different subdirectories share a backup path;
+            # only the last is copied, matching what sequential copies would leave
+            backups = {backup_location / os.path.basename(filepath): filepath
+                       for filepath, _ in plans}
+            backup_errors = self._copy_backups(backups)
+
+        # Bind the per-file lookups once for the loop
+        basename, dirname, join, rename = os.path.basename, os.path.dirname, os.path.join, os.rename
+        backup_append = self.backup_files.append
+        renamed_append = self.renamed_files.append
+        for filepath, new_filename in plans:
+            filename = basename(filepath)
+            try:
+                # Create backup if enabled
+                if backup_location:
+                    error = backup_errors.get(backup_location / filename)
+                    if error is not None:
+                        raise error
+                    backup_append(filename)
+                
+                # Rename the file
+                rename(filepath, join(dirname(filepath), new_filename))
+                renamed_append((filename, new_filename))
+            except OSError as e:
+                print(f"Error renaming {filename}: {e}")
+
+    @staticmethod
+    def _copy_backups(backups):
+        """Copy files to their {backup_path: filepath} destinations.
         
-        # Create the new filename with datetime/date prefix and original extension
-        new_filename = f"{date_str}_{name_without_date}.{ext}"
-        new_filepath = path.parent / new_filename
-
-        try:
-            # Create backup if enabled
-            if self.backup_enabled and self.backup_location:
-                backup_path = self.backup_location / filename
-                shutil.copy2(path, backup_path)
-                self.backup_files.append(filename)
-            
-            # Rename the file
-            path.rename(new_filepath)
-            self.renamed_files.append((filename, new_filename))
-        except OSError as e:
-            print(f"Error renaming {filename}: {e}")
+        Returns a {backup_path: OSError} dict for the copies that failed.
+        """
+        def copy(item):
+            backup_path, filepath = item
+            try:
+                _cheap_backup(filepath, backup_path)
+            except OSError as e:
+                return backup_path, e
+            return backup_path, None
+
+        if len(backups) > 1:
+            with ThreadPoolExecutor() as pool:
+                results = list(pool.map(copy, backups.items()))
+        else:
+            results = map(copy, backups.items())
+        return {backup_path: error for backup_path, error in results if error is not None}
 
     def process_directory(self, directory, recursive=False):
         """Process all files in the given directory."""
         directory = Path(directory)
         print(f"Processing directory: {directory}")
         
-        # Create backup directory if backups are enabled
+        # Choose the backup directory if backups are enabled; it is only created
+        # once there is a file to back up
         if self.backup_enabled:
             if self.backup_dir:
                 self.backup_location = self.backup_dir
             else:
-                # Default: create .backup subfolder in the target directory
+                # Default: .backup subfolder in the target directory
                 self.backup_location = directory / ".backup"
             
-            self.backup_location.mkdir(parents=True, exist_ok=True)
+            self._backup_ready = False
             print(f"Backup location: {self.backup_location}")
         
-        if recursive:
-            files = [f for f in directory.rglob('*') if f.is_file()]
-        else:
-            files = [f for f in directory.iterdir() if f.is_file()]
+        # Sorting by name clusters files that share a naming scheme, and makes the
+        # processing order (and so the summary) independent of directory order
+        files = sorted(_iter_files(directory, recursive), key=os.path.basename)
+        filenames = [os.path.basename(f) for f in files]
+        
+        if self.verbose:
+            print(f"Found files: {filenames}")
+        
+        new_filenames = self._classify_all(filenames)
+        
+        if self.verbose:
+            # One write per batch of lines rather than one print per file
+            for start in range(0, len(files), _LOG_BATCH_SIZE):
+                sys.stdout.write(''.join(f"Processing file: {file_path}\n"
+                                         for file_path in files[start:start + _LOG_BATCH_SIZE]))
         
-        print(f"Found files: {[f.name for f in files]}")
+        # Build the results straight from the classified names rather than
+        # appending file by file
+        self.skipped_files.extend(filename for filename, new_filename in zip(filenames, new_filenames)
+                                  if new_filename is None)
+        plans = [(file_path, new_filename) for file_path, new_filename in zip(files, new_filenames)
+                 if new_filename is not None]
         
-        for file_path in files:
-            print(f"Processing file: {file_path}")
-            self.rename_file(file_path)
-            print(f"Renamed files so far: {self.renamed_files}")
-            print(f"Skipped files so far: {self.skipped_files}")
+        # Back up and rename as one batch so backup copies can overlap
+        self._apply_renames(plans)
 
     def print_summary(self):
         """Print a summary of the renaming operation."""
@@ -1,6 +1,9 @@
 """Tests for the DateFileRenamer class."""
 
 
+import errno
+import os
+import shutil
 import pytest
 from pathlib import Path
 from datetime import datetime
@@ -51,6 +54,31 @@ def test_invalid_date(renamer):
     assert date_str is None
     assert matched_date is None
 
+@pytest.mark.parametrize("input_file,expected_date", [
+    ("scan_2024-02-29.pdf", "20240229"),  # Leap year
+    ("scan_2023-02-29.pdf", None),
+    ("scan_1900-02-29.pdf", None),  # Century, not a leap year
+    ("scan_2000-02-29.pdf", "20000229"),  # Divisible by 400
+    ("scan_2024-04-31.pdf", None),
+])
+def test_date_validation(renamer, input_file, expected_date):
+    """Test that impossible calendar dates are rejected."""
+    date_str, _ = renamer.extract_date(input_file)
+    assert date_str == expected_date
+
+def test_non_ascii_digits_ignored(renamer):
+    """Test that only ASCII digits are read as dates, as with strptime."""
+    assert renamer.extract_date("scan_\u0662\u0660\u0662\u0664-\u0660\u0661-\u0661\u0665.pdf") == (None, None)
+    datetime_str, _, has_time = renamer.extract_datetime(
+        "photo_\u0662\u0660\u0662\u0664\u0660\u0663\u0661\u0665_\u0661\u0662\u0660\u0660\u0660\u0660.jpg")
+    assert datetime_str is None
+    assert has_time is False
+
+@pytest.mark.parametrize("input_file", ["report_\u017fep_08_21.txt", "08\u017fep21.txt"])
+def test_non_ascii_month_lookalike_ignored(renamer, input_file):
+    """Test that letters which only case-fold to a month name (e.g. long s) aren't matched."""
+    assert renamer.extract_date(input_file) == (None, None)
+
 def test_no_date(renamer):
     """Test handling files without dates."""
     filename = "no_date_file.txt"
@@ -80,14 +108,26 @@ def test_process_directory(renamer, temp_directory):
     # Check summary counts
     assert len(renamer.renamed_files) == 5  # All files with dates
     assert len(renamer.skipped_files) == 1  # no_date_file.txt
+    
+    # Files are processed in name order, whatever order the directory lists them in
+    old_names = [old_name for old_name, _ in renamer.renamed_files]
+    assert old_names == sorted(old_names)
 
-def test_multiple_dates(renamer):
-    """Test handling filenames with multiple date patterns."""
-    filename = "2024-01-15_report_Mar-8-21.txt"
+@pytest.mark.parametrize("filename,expected_date,expected_match", [
+    ("2024-01-15_report_Mar-8-21.txt", "20240115", "2024-01-15"),
+    # Leftmost date wins, even over a pattern declared earlier
+    ("Mar-08-21_report_2024-01-15.txt", "20210308", "Mar-08-21"),
+    # An invalid earlier candidate doesn't stop the search
+    ("report_13-45-2024_2024-01-15.txt", "20240115", "2024-01-15"),
+    ("2023_12000013.20201231", "20201231", "20201231"),
+    # YYYYMMDD is invalid here, so MMDDYYYY/DDMMYYYY is tried at the same position
+    ("scan_13122024.pdf", "20241213", "13122024"),
+])
+def test_multiple_dates(renamer, filename, expected_date, expected_match):
+    """Test that the first valid date in the filename is used."""
     date_str, matched_date = renamer.extract_date(filename)
-    # Should use the first valid date found
-    assert date_str == "20240115"
-    assert matched_date == "2024-01-15"
+    assert date_str == expected_date
+    assert matched_date == expected_match
 
 
 @pytest.mark.parametrize("input_file,expected_datetime,expected_match", [
@@ -104,6 +144,19 @@ def test_extract_datetime_formats(renamer, input_file, expected_datetime, expect
     assert has_time is True
 
 
+@pytest.mark.parametrize("input_file", [
+    "photo_20240315_250000.jpg",  # Hour 25
+    "photo_20240315_126000.jpg",  # Minute 60
+    "photo_20240315_120060.jpg",  # Second 60
+    "photo_20230229_120000.jpg",  # Not a leap year
+])
+def test_invalid_datetime(renamer, input_file):
+    """Test that impossible dates and times are rejected."""
+    datetime_str, matched_str, has_time = renamer.extract_datetime(input_file)
+    assert datetime_str is None
+    assert has_time is False
+
+
 def test_no_datetime(renamer):
     """Test handling files without datetime."""
     filename = "report_2023-12-25.txt"  # Only has date, not datetime
@@ -144,6 +197,20 @@ def test_rename_file_with_datetime_and_prefix(renamer, tmp_path):
     assert len(renamer.renamed_files) == 1
 
 
+@pytest.mark.parametrize("input_file,expected_file", [
+    ("report_2024-03-15", "20240315_report"),  # No extension
+    ("archive_2024-03-15.tar.gz", "20240315_archive.tar.gz"),
+])
+def test_rename_file_extensions(renamer, tmp_path, input_file, expected_file):
+    """Test that only the real extension is carried over to the new name."""
+    test_file = tmp_path / input_file
+    test_file.write_text("test content")
+    
+    renamer.rename_file(test_file)
+    
+    assert (tmp_path / expected_file).exists()
+
+
 def test_backup_enabled_by_default(tmp_path):
     """Test that backups are created by default."""
     # Create test file
@@ -164,6 +231,60 @@ def test_backup_enabled_by_default(tmp_path):
     assert not test_file.exists()
 
 
+def test_backup_preserves_content_and_mtime(tmp_path):
+    """Test that backups keep the original content and modification time."""
+    test_file = tmp_path / "report_2024-03-15.pdf"
+    test_file.write_text("test content")
+    os.utime(test_file, (1_000_000_000, 1_000_000_000))
+    
+    renamer = DateFileRenamer()
+    renamer.process_directory(tmp_path)
+    
+    backup_file = tmp_path / ".backup" / "report_2024-03-15.pdf"
+    assert backup_file.read_text() == "test content"
+    assert backup_file.stat().st_mtime == 1_000_000_000
+
+
+def test_backup_stops_cloning_after_unsupported(tmp_path, monkeypatch):
+    """Test that a filesystem without reflinks falls back to copying, once."""
+    from date_renamer import renamer as renamer_module
+    ioctl_calls = []
+    
+    class FakeFcntl:
+        @staticmethod
+        def ioctl(*args):
+            ioctl_calls.append(args)
+            raise OSError(errno.EOPNOTSUPP, "Operation not supported")
+    
+    monkeypatch.setattr(renamer_module, "fcntl", FakeFcntl)
+    monkeypatch.setattr(renamer_module, "_FICLONE", 0, raising=False)
+    monkeypatch.setattr(renamer_module, "_no_clone_dirs", set())
+    backup_dir = tmp_path / "backup"
+    backup_dir.mkdir()
+    for name in ("a.txt", "b.txt"):
+        (tmp_path / name).write_text(f"{name} content")
+        renamer_module._cheap_backup(tmp_path / name, backup_dir / name)
+        assert (backup_dir / name).read_text() == f"{name} content"
+    
+    assert len(ioctl_calls) == 1
+
+
+def test_backup_onto_itself_keeps_file(tmp_path):
+    """Test that a file already in the backup directory is never truncated or deleted."""
+    backup_dir = tmp_path / ".backup"
+    backup_dir.mkdir()
+    backed_up = backup_dir / "a_2024-03-15.txt"
+    backed_up.write_text("test content")
+    
+    from date_renamer import renamer as renamer_module
+    with pytest.raises(shutil.SameFileError):
+        renamer_module._cheap_backup(backed_up, backed_up)
+    assert backed_up.read_text() == "test content"
+    
+    DateFileRenamer().process_directory(tmp_path, recursive=True)
+    assert backed_up.read_text() == "test content"
+
+
 def test_backup_can_be_disabled(tmp_path):
     """Test that backups can be disabled with backup_dir=False."""
     # Create test file
@@ -180,4 +301,98 @@ def test_backup_can_be_disabled(tmp_path):
     
     # Check that original file was renamed
     assert (tmp_path / "20240312_invoice.pdf").exists()
-    assert not test_file.exists()
\ No newline at end of file
+    assert not test_file.exists()
+
+def test_extract_date_without_hyperscan(monkeypatch):
+    """Test that extraction falls back to re when hyperscan is unavailable."""
+    from date_renamer import renamer as renamer_module
+    monkeypatch.setattr(renamer_module, "hyperscan", None)
+    # Prefilters are cached across instances, so build them afresh
+    DateFileRenamer._build_prefilter.cache_clear()
+    try:
+        renamer = DateFileRenamer()
+        assert renamer.extract_date("invoice_12-03-2024.pdf") == ("20240312", "12-03-2024")
+        assert renamer.extract_date("IMG-20260204-WA0002.jpeg") == ("20260204", "20260204")
+        assert renamer.extract_date("no_date_file.txt") == (None, None)
+    finally:
+        DateFileRenamer._build_prefilter.cache_clear()
+
+
+def test_process_directory_recursive(tmp_path):
+    """Test that recursive processing renames files in subdirectories."""
+    subdir = tmp_path / "nested"
+    subdir.mkdir()
+    (tmp_path / "top_2024-03-15.txt").write_text("test content")
+    (subdir / "inner_2023-12-25.txt").write_text("test content")
+    
+    renamer = DateFileRenamer(backup_dir=False)
+    renamer.process_directory(tmp_path, recursive=True)
+    
+    assert (tmp_path / "20240315_top.txt").exists()
+    assert (subdir / "20231225_inner.txt").exists()
+    assert len(renamer.renamed_files) == 2
+
+
+def test_process_directory_in_worker_processes(temp_directory, monkeypatch):
+    """Test that classifying filenames in worker processes gives the same result."""
+    from date_renamer import renamer as renamer_module
+    monkeypatch.setattr(renamer_module, "_PARALLEL_THRESHOLD", 1)
+    monkeypatch.setattr(renamer_module, "_available_cpus", lambda: 2)
+    
+    renamer = DateFileRenamer(backup_dir=False)
+    renamer.process_directory(temp_directory)
+    
+    assert (temp_directory / "20240312_invoice.pdf").exists()
+    assert len(renamer.renamed_files) == 5
+    assert renamer.skipped_files == ["no_date_file.txt"]
+
+
+def test_verbose_logs_each_file(temp_directory, capsys):
+    """Test that per-file logging only happens in verbose mode."""
+    DateFileRenamer(backup_dir=False).process_directory(temp_directory)
+    assert "Processing file:" not in capsys.readouterr().out
+    
+    DateFileRenamer(backup_dir=False, verbose=True).process_directory(temp_directory)
+    assert capsys.readouterr().out.count("Processing file:") == 6
+
+
+def test_backup_directory_not_created_without_renames(tmp_path):
+    """Test that no backup directory is created when nothing is renamed."""
+    (tmp_path / "no_date_file.txt").write_text("test content")
+    
+    renamer = DateFileRenamer()
+    renamer.process_directory(tmp_path)
+    
+    assert not (tmp_path / ".backup").exists()
+    assert renamer.skipped_files == ["no_date_file.txt"]
+
+
+def test_extraction_cache_is_bounded(renamer, monkeypatch):
+    """Test that the extraction caches don't grow without limit."""
+    from date_renamer import renamer as renamer_module
+    monkeypatch.setattr(renamer_module, "_CACHE_SIZE", 3)
+    for day in range(1, 11):
+        assert renamer.extract_date(f"scan_2024-01-{day:02d}.pdf")[0] == f"202401{day:02d}"
+    assert len(renamer._date_cache) <= 3
+
+
+def test_process_directory_recursive_skips_unreadable(tmp_path, monkeypatch):
+    """Test that an unreadable subdirectory doesn't stop a recursive run."""
+    locked = tmp_path / "locked"
+    locked.mkdir()
+    (locked / "inner_2023-12-25.txt").write_text("test content")
+    (tmp_path / "top_2024-03-15.txt").write_text("test content")
+    
+    real_scandir = os.scandir
+    def scandir(path):
+        if os.fspath(path) == str(locked):
+            raise PermissionError(13, "Permission denied", str(path))
+        return real_scandir(path)
+    monkeypatch.setattr(os, "scandir", scandir)
+    
+    renamer = DateFileRenamer(backup_dir=False)
+    renamer.process_directory(tmp_path, recursive=True)
+    
+    assert (tmp_path / "20240315_top.txt").exists()
+    assert (locked / "inner_2023-12-25.txt").exists()
+    assert len(renamer.renamed_files) == 1